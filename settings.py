@@ -6,20 +6,137 @@ Advanced configuration and settings management
 
 import gi
 gi.require_version('Gtk', '3.0')
-gi.require_version('XApp', '1.0')
-from gi.repository import Gtk, Gio, GLib, XApp
+from gi.repository import Gtk, GLib
+import bisect
+import contextlib
+import collections
+import copy
+import itertools
 import json
+import logging
+import mmap
 import os
-import configparser
+import sys
+import threading
+import time
 from pathlib import Path
-from datetime import datetime, timedelta
+
+_log = logging.getLogger(__name__)
+
+# orjson is optional; fall back to the stdlib parser when it isn't installed
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+def _json_loads(data):
+    """Parse JSON from bytes"""
+    if orjson:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def _json_load_file(path):
+    """Parse a JSON file through a read-only memory map"""
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return {}
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            if orjson:
+                with memoryview(mm) as view:
+                    return orjson.loads(view)
+            return json.loads(mm[:])
+
+def _json_dumps(obj):
+    """Serialize to indented JSON bytes"""
+    if orjson:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, indent=2).encode('utf-8')
+
+def _write_all(fd, data):
+    """Write all of data to a file descriptor"""
+    view = memoryview(data)
+    while view:
+        view = view[os.write(fd, view):]
+
+def _str_list(value):
+    """String entries of a hand-editable list setting; anything else is ignored"""
+    if not isinstance(value, list):
+        return []
+    return [item for item in value if isinstance(item, str)]
+
+# Per-user locations, resolved once at import
+_HOME = Path.home()
+_CONFIG_DIR = _HOME / ".config" / "xclamav"
+_DEFAULT_QUARANTINE = str(_HOME / ".local" / "share" / "xclamav" / "quarantine")
+
+# Default settings; deep-copied whenever a mutable tree is needed
+_DEFAULT_SETTINGS = {
+    "scan_options": {
+        "scan_archives": True,
+        "scan_pdf": True,
+        "scan_ole2": True,
+        "scan_html": True,
+        "scan_pe": True,
+        "scan_elf": True,
+        "detect_pua": False,
+        "scan_hidden": False,
+        "max_file_size": 20,  # MB
+        "max_recursion": 15
+    },
+    "real_time": {
+        "enabled": False,
+        "watch_downloads": True,
+        "watch_home": False,
+        "watch_removable": True,
+        "prevention_mode": False
+    },
+    "updates": {
+        "auto_update": True,
+        "update_frequency": "daily",  # daily, weekly, manual
+        "check_on_startup": True
+    },
+    "notifications": {
+        "show_scan_complete": True,
+        "show_threats_found": True,
+        "show_update_complete": False,
+        "system_tray": True
+    },
+    "quarantine": {
+        "auto_quarantine": True,
+        "quarantine_path": _DEFAULT_QUARANTINE,
+        "retention_days": 30
+    },
+    "interface": {
+        "start_minimized": False,
+        "close_to_tray": True,
+        "dark_mode": "auto",  # auto, light, dark
+        "language": "auto"
+    },
+    "exclusions": {
+        "paths": [],
+        "extensions": [".tmp", ".log"],
+        "processes": []
+    },
+    "advanced": {
+        "scan_threads": 4,
+        "memory_limit": 512,  # MB
+        "database_mirror": "auto",
+        "log_level": "info"  # debug, info, warning, error
+    }
+}
 
 class XClamAVSettings:
     """Settings management class"""
     
+    default_settings = _DEFAULT_SETTINGS
+    
     def __init__(self):
-        self.config_dir = Path.home() / ".config" / "xclamav"
+        self.config_dir = _CONFIG_DIR
         self.config_file = self.config_dir / "settings.json"
+        self._dirty = False
+        self._flush_source = 0
+        self._batch_depth = 0
+        self._mtime_ns = None
         self.ensure_config_dir()
         self.load_settings()
     
@@ -29,90 +146,138 @@ class XClamAVSettings:
     
     def load_settings(self):
         """Load settings from file"""
-        self.default_settings = {
-            "scan_options": {
-                "scan_archives": True,
-                "scan_pdf": True,
-                "scan_ole2": True,
-                "scan_html": True,
-                "scan_pe": True,
-                "scan_elf": True,
-                "detect_pua": False,
-                "scan_hidden": False,
-                "max_file_size": 20,  # MB
-                "max_recursion": 15
-            },
-            "real_time": {
-                "enabled": False,
-                "watch_downloads": True,
-                "watch_home": False,
-                "watch_removable": True,
-                "prevention_mode": False
-            },
-            "updates": {
-                "auto_update": True,
-                "update_frequency": "daily",  # daily, weekly, manual
-                "check_on_startup": True
-            },
-            "notifications": {
-                "show_scan_complete": True,
-                "show_threats_found": True,
-                "show_update_complete": False,
-                "system_tray": True
-            },
-            "quarantine": {
-                "auto_quarantine": True,
-                "quarantine_path": str(Path.home() / ".local" / "share" / "xclamav" / "quarantine"),
-                "retention_days": 30
-            },
-            "interface": {
-                "start_minimized": False,
-                "close_to_tray": True,
-                "dark_mode": "auto",  # auto, light, dark
-                "language": "auto"
-            },
-            "exclusions": {
-                "paths": [],
-                "extensions": [".tmp", ".log"],
-                "processes": []
-            },
-            "advanced": {
-                "scan_threads": 4,
-                "memory_limit": 512,  # MB
-                "database_mirror": "auto",
-                "log_level": "info"  # debug, info, warning, error
-            }
-        }
-        
-        if self.config_file.exists():
+        self.settings = None
+        self._mtime_ns = self._file_mtime_ns()
+        if self._mtime_ns is not None:
             try:
-                with open(self.config_file, 'r') as f:
-                    loaded_settings = json.load(f)
-                    # Merge with defaults to handle new settings
-                    self.settings = self._merge_settings(self.default_settings, loaded_settings)
+                loaded_settings = _json_load_file(self.config_file)
+                if self._has_all_defaults(loaded_settings):
+                    # Saved file already holds every setting; use it as is
+                    self.settings = loaded_settings
+                else:
+                    # Overlay saved values on the defaults to handle new settings
+                    self.settings = copy.deepcopy(_DEFAULT_SETTINGS)
+                    self._apply_overrides(self.settings, loaded_settings)
             except Exception as e:
-                print(f"Error loading settings: {e}")
-                self.settings = self.default_settings.copy()
-        else:
-            self.settings = self.default_settings.copy()
+                _log.warning("settings load failed: %s", e)
+                self.settings = None
+        if self.settings is None:
+            self.settings = copy.deepcopy(_DEFAULT_SETTINGS)
+        self._intern_keys()
+        self._index_exclusions()
+    
+    def _file_mtime_ns(self):
+        """Modification time of the settings file, or None if it is missing"""
+        try:
+            return os.stat(self.config_file).st_mtime_ns
+        except OSError:
+            return None
+    
+    def reload(self):
+        """Re-read the settings file if it changed since it was last loaded or saved"""
+        if self._dirty or self._file_mtime_ns() == self._mtime_ns:
+            return False
+        self.load_settings()
+        return True
+    
+    def _has_all_defaults(self, loaded):
+        """Check whether loaded settings contain every default category and key"""
+        for category, defaults in _DEFAULT_SETTINGS.items():
+            section = loaded.get(category)
+            if not isinstance(section, dict) or not section.keys() >= defaults.keys():
+                return False
+        return True
+    
+    def _intern_keys(self):
+        """Intern category and key names so lookups compare by identity"""
+        self.settings = {
+            sys.intern(category): (
+                {sys.intern(key): value for key, value in section.items()}
+                if isinstance(section, dict) else section
+            )
+            for category, section in self.settings.items()
+        }
     
-    def _merge_settings(self, default, loaded):
-        """Recursively merge loaded settings with defaults"""
-        result = default.copy()
+    def _index_exclusions(self):
+        """Rebuild in-memory lookup structures for the exclusion lists"""
+        exclusions = self.settings.get("exclusions")
+        if not isinstance(exclusions, dict):
+            exclusions = {}
+        self._ext_excl_set = frozenset(ext.lower() for ext in _str_list(exclusions.get("extensions")))
+        
+        # Sorted directory prefixes with nested entries dropped, so the only
+        # candidate for a path is the greatest prefix sorting before it
+        prefixes = []
+        for prefix in sorted({os.path.join(os.path.normpath(p), "") for p in _str_list(exclusions.get("paths"))}):
+            if not prefixes or not prefix.startswith(prefixes[-1]):
+                prefixes.append(prefix)
+        self._excl_paths_sorted = tuple(prefixes)
+    
+    def is_excluded_ext(self, ext):
+        """Check whether a file extension (e.g. ".tmp") is excluded"""
+        return ext.lower() in self._ext_excl_set
+    
+    def is_path_excluded(self, path):
+        """Check whether a path lies inside an excluded directory"""
+        path = os.path.join(os.path.normpath(path), "")
+        index = bisect.bisect_right(self._excl_paths_sorted, path)
+        return index > 0 and path.startswith(self._excl_paths_sorted[index - 1])
+    
+    def _apply_overrides(self, base, loaded):
+        """Recursively merge loaded settings into base in place"""
         for key, value in loaded.items():
-            if key in result and isinstance(result[key], dict) and isinstance(value, dict):
-                result[key] = self._merge_settings(result[key], value)
+            if isinstance(value, dict) and isinstance(base.get(key), dict):
+                self._apply_overrides(base[key], value)
             else:
-                result[key] = value
-        return result
+                base[key] = value
     
     def save_settings(self):
         """Save settings to file"""
         try:
-            with open(self.config_file, 'w') as f:
-                json.dump(self.settings, f, indent=2)
+            data = _json_dumps(self.settings)
+            tmp_file = self.config_file.with_suffix('.json.tmp')
+            fd = os.open(tmp_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            try:
+                _write_all(fd, data)
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+            # Atomically replace the old file so a crash never leaves it truncated
+            os.replace(tmp_file, self.config_file)
+            self._mtime_ns = self._file_mtime_ns()
         except Exception as e:
-            print(f"Error saving settings: {e}")
+            _log.warning("settings save failed: %s", e)
+    
+    def _schedule_flush(self):
+        """Coalesce pending changes into one delayed save"""
+        self._dirty = True
+        if not self._flush_source and not self._batch_depth:
+            self._flush_source = GLib.timeout_add(250, self._flush)
+    
+    def _flush(self):
+        """Timeout callback writing pending changes"""
+        self._flush_source = 0
+        if self._dirty:
+            self._dirty = False
+            self.save_settings()
+        return False
+    
+    def flush(self):
+        """Write pending changes to disk immediately"""
+        if self._flush_source:
+            GLib.source_remove(self._flush_source)
+        self._flush()
+    
+    @contextlib.contextmanager
+    def batch(self):
+        """Hold back saving until the block ends, then save once"""
+        self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+            if not self._batch_depth:
+                self.flush()
     
     def get(self, category, key=None):
         """Get setting value"""
@@ -125,15 +290,143 @@ class XClamAVSettings:
         if category not in self.settings:
             self.settings[category] = {}
         self.settings[category][key] = value
+        if category == "exclusions":
+            self._index_exclusions()
+        self._schedule_flush()
+    
+    def update_section(self, category, values):
+        """Set several keys of one category at once"""
+        self.settings.setdefault(category, {}).update(values)
+        if category == "exclusions":
+            self._index_exclusions()
+        self._schedule_flush()
+    
+    def reset(self):
+        """Reset all settings to defaults and save"""
+        self.settings = copy.deepcopy(_DEFAULT_SETTINGS)
+        self._index_exclusions()
         self.save_settings()
 
+# Settings notebook pages as (label, settings section, extra object ids).
+# Each page is the "<section>_page" object in settings.ui; the extra ids
+# are adjustments and models it references, which GtkBuilder does not
+# pull in on its own.
+_UI_FILE = str(Path(__file__).with_name("settings.ui"))
+_TABS = (
+    ("Scan Options", "scan_options", ("max_file_adjustment", "max_recursion_adjustment")),
+    ("Real-time", "real_time", ()),
+    ("Updates", "updates", ()),
+    ("Notifications", "notifications", ()),
+    ("Quarantine", "quarantine", ("retention_adjustment",)),
+    ("Interface", "interface", ()),
+    ("Exclusions", "exclusions", ("paths_liststore", "extensions_liststore")),
+    ("Advanced", "advanced", ("threads_adjustment", "memory_adjustment")),
+)
+
+def _row_index(values, default=0):
+    """Map each combo value to its row; None maps to the default row"""
+    index = {v: i for i, v in enumerate(values)}
+    index[None] = default
+    return index
+
+# Combo box entries in row order, and the reverse lookup to a row
+_IDX_TO_FREQ = ("daily", "weekly", "manual")
+_IDX_TO_THEME = ("auto", "light", "dark")
+_IDX_TO_LANG = ("auto", "en", "he", "es", "fr", "de")
+_IDX_TO_MIRROR = ("auto", "official", "custom")
+_IDX_TO_LOGLEVEL = ("debug", "info", "warning", "error")
+_FREQ_TO_IDX = _row_index(_IDX_TO_FREQ)
+_THEME_TO_IDX = _row_index(_IDX_TO_THEME)
+_LANG_TO_IDX = _row_index(_IDX_TO_LANG)
+_MIRROR_TO_IDX = _row_index(_IDX_TO_MIRROR)
+_LOGLEVEL_TO_IDX = _row_index(_IDX_TO_LOGLEVEL, 1)
+
+def _combo_accessors(values, index):
+    """Getter and setter translating between a combo row and its value"""
+    fallback = index[None]
+    
+    def get(w):
+        # get_active() is -1 with no row selected, which a tuple would
+        # silently wrap to the last entry
+        row = w.get_active()
+        return values[row if row >= 0 else fallback]
+    
+    return get, lambda w, v: w.set_active(index.get(v, fallback))
+
+# Widget (getter, setter) pairs by field kind
+_KINDS = {
+    "bool": (lambda w: w.get_active(), lambda w, v: w.set_active(v)),
+    "int": (lambda w: int(w.get_value()), lambda w, v: w.set_value(v)),
+    "text": (lambda w: w.get_text(), lambda w, v: w.set_text(v)),
+    "frequency": _combo_accessors(_IDX_TO_FREQ, _FREQ_TO_IDX),
+    "theme": _combo_accessors(_IDX_TO_THEME, _THEME_TO_IDX),
+    "language": _combo_accessors(_IDX_TO_LANG, _LANG_TO_IDX),
+    "mirror": _combo_accessors(_IDX_TO_MIRROR, _MIRROR_TO_IDX),
+    "log_level": _combo_accessors(_IDX_TO_LOGLEVEL, _LOGLEVEL_TO_IDX),
+}
+
+# Dialog fields as (widget name, settings section, key, kind, default).
+# Combos leave the default as None; their row index resolves it.
+_FIELDS = (
+    ("scan_archives_check", "scan_options", "scan_archives", "bool", True),
+    ("scan_pdf_check", "scan_options", "scan_pdf", "bool", True),
+    ("scan_ole2_check", "scan_options", "scan_ole2", "bool", True),
+    ("scan_html_check", "scan_options", "scan_html", "bool", True),
+    ("scan_pe_check", "scan_options", "scan_pe", "bool", True),
+    ("scan_elf_check", "scan_options", "scan_elf", "bool", True),
+    ("detect_pua_check", "scan_options", "detect_pua", "bool", False),
+    ("scan_hidden_check", "scan_options", "scan_hidden", "bool", False),
+    ("max_file_spin", "scan_options", "max_file_size", "int", 20),
+    ("max_recursion_spin", "scan_options", "max_recursion", "int", 15),
+    ("realtime_enabled_check", "real_time", "enabled", "bool", False),
+    ("watch_downloads_check", "real_time", "watch_downloads", "bool", True),
+    ("watch_home_check", "real_time", "watch_home", "bool", False),
+    ("watch_removable_check", "real_time", "watch_removable", "bool", True),
+    ("prevention_mode_check", "real_time", "prevention_mode", "bool", False),
+    ("auto_update_check", "updates", "auto_update", "bool", True),
+    ("check_startup_check", "updates", "check_on_startup", "bool", True),
+    ("frequency_combo", "updates", "update_frequency", "frequency", None),
+    ("show_scan_complete_check", "notifications", "show_scan_complete", "bool", True),
+    ("show_threats_found_check", "notifications", "show_threats_found", "bool", True),
+    ("show_update_complete_check", "notifications", "show_update_complete", "bool", False),
+    ("system_tray_check", "notifications", "system_tray", "bool", True),
+    ("auto_quarantine_check", "quarantine", "auto_quarantine", "bool", True),
+    ("quarantine_path_entry", "quarantine", "quarantine_path", "text", ""),
+    ("retention_spin", "quarantine", "retention_days", "int", 30),
+    ("start_minimized_check", "interface", "start_minimized", "bool", False),
+    ("close_to_tray_check", "interface", "close_to_tray", "bool", True),
+    ("theme_combo", "interface", "dark_mode", "theme", None),
+    ("language_combo", "interface", "language", "language", None),
+    ("threads_spin", "advanced", "scan_threads", "int", 4),
+    ("memory_spin", "advanced", "memory_limit", "int", 512),
+    ("mirror_combo", "advanced", "database_mirror", "mirror", None),
+    ("log_level_combo", "advanced", "log_level", "log_level", None),
+)
+
+# _FIELDS with each kind resolved to its (getter, setter) pair up front
+_FIELD_ACCESSORS = tuple(
+    (name, section, key, *_KINDS[kind], default)
+    for name, section, key, kind, default in _FIELDS
+)
+
+def _set_margins(widget, margin=12):
+    """Apply the same margin on all four sides"""
+    widget.set_margin_left(margin)
+    widget.set_margin_right(margin)
+    widget.set_margin_top(margin)
+    widget.set_margin_bottom(margin)
+
 class SettingsDialog(Gtk.Dialog):
     """Settings dialog window"""
     
-    def __init__(self, parent, settings):
+    def __init__(self, parent, settings, clamd_active=False):
         super().__init__(title="XClamAV Settings", transient_for=parent, modal=True)
         
         self.settings = settings
+        # Scans go through clamd, which ignores the Scan Options page
+        self._clamd_active = clamd_active
+        # Values last loaded into (or saved from) the widgets, per section
+        self._loaded = {}
         self.add_buttons(
             Gtk.STOCK_CANCEL, Gtk.ResponseType.CANCEL,
             Gtk.STOCK_APPLY, Gtk.ResponseType.APPLY,
@@ -142,673 +435,139 @@ class SettingsDialog(Gtk.Dialog):
         
         self.set_default_size(600, 500)
         self.setup_ui()
-        self.load_current_settings()
     
     def setup_ui(self):
         """Setup the settings UI"""
         content_area = self.get_content_area()
-        content_area.set_margin_left(12)
-        content_area.set_margin_right(12)
-        content_area.set_margin_top(12)
-        content_area.set_margin_bottom(12)
+        _set_margins(content_area)
         
         # Create notebook for different setting categories
         self.notebook = Gtk.Notebook()
         content_area.pack_start(self.notebook, True, True, 0)
         
-        # Scan Options Tab
-        self.create_scan_options_tab()
-        
-        # Real-time Protection Tab
-        self.create_realtime_tab()
-        
-        # Updates Tab
-        self.create_updates_tab()
-        
-        # Notifications Tab
-        self.create_notifications_tab()
-        
-        # Quarantine Tab
-        self.create_quarantine_tab()
-        
-        # Interface Tab
-        self.create_interface_tab()
-        
-        # Exclusions Tab
-        self.create_exclusions_tab()
-        
-        # Advanced Tab
-        self.create_advanced_tab()
-    
-    def create_scan_options_tab(self):
-        """Create scan options tab"""
-        scrolled = Gtk.ScrolledWindow()
-        scrolled.set_policy(Gtk.PolicyType.NEVER, Gtk.PolicyType.AUTOMATIC)
-        
-        box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=12)
-        box.set_margin_left(12)
-        box.set_margin_right(12)
-        box.set_margin_top(12)
-        box.set_margin_bottom(12)
-        
-        # File types frame
-        file_types_frame = Gtk.Frame(label="File Types to Scan")
-        file_types_grid = Gtk.Grid()
-        file_types_grid.set_margin_left(12)
-        file_types_grid.set_margin_right(12)
-        file_types_grid.set_margin_top(12)
-        file_types_grid.set_margin_bottom(12)
-        file_types_grid.set_row_spacing(6)
-        file_types_grid.set_column_spacing(12)
-        
-        self.scan_archives_check = Gtk.CheckButton.new_with_label("Scan archive files (ZIP, RAR, etc.)")
-        self.scan_pdf_check = Gtk.CheckButton.new_with_label("Scan PDF documents")
-        self.scan_ole2_check = Gtk.CheckButton.new_with_label("Scan Office documents")
-        self.scan_html_check = Gtk.CheckButton.new_with_label("Scan HTML files")
-        self.scan_pe_check = Gtk.CheckButton.new_with_label("Scan Windows executables")
-        self.scan_elf_check = Gtk.CheckButton.new_with_label("Scan Linux executables")
-        
-        file_types_grid.attach(self.scan_archives_check, 0, 0, 2, 1)
-        file_types_grid.attach(self.scan_pdf_check, 0, 1, 2, 1)
-        file_types_grid.attach(self.scan_ole2_check, 0, 2, 2, 1)
-        file_types_grid.attach(self.scan_html_check, 0, 3, 2, 1)
-        file_types_grid.attach(self.scan_pe_check, 0, 4, 2, 1)
-        file_types_grid.attach(self.scan_elf_check, 0, 5, 2, 1)
-        
-        file_types_frame.add(file_types_grid)
-        
-        # Detection options frame
-        detection_frame = Gtk.Frame(label="Detection Options")
-        detection_grid = Gtk.Grid()
-        detection_grid.set_margin_left(12)
-        detection_grid.set_margin_right(12)
-        detection_grid.set_margin_top(12)
-        detection_grid.set_margin_bottom(12)
-        detection_grid.set_row_spacing(6)
-        detection_grid.set_column_spacing(12)
-        
-        self.detect_pua_check = Gtk.CheckButton.new_with_label("Detect potentially unwanted applications (PUA)")
-        self.scan_hidden_check = Gtk.CheckButton.new_with_label("Scan hidden files and directories")
-        
-        detection_grid.attach(self.detect_pua_check, 0, 0, 2, 1)
-        detection_grid.attach(self.scan_hidden_check, 0, 1, 2, 1)
-        
-        detection_frame.add(detection_grid)
-        
-        # Limits frame
-        limits_frame = Gtk.Frame(label="Scan Limits")
-        limits_grid = Gtk.Grid()
-        limits_grid.set_margin_left(12)
-        limits_grid.set_margin_right(12)
-        limits_grid.set_margin_top(12)
-        limits_grid.set_margin_bottom(12)
-        limits_grid.set_row_spacing(6)
-        limits_grid.set_column_spacing(12)
-        
-        max_file_label = Gtk.Label("Maximum file size to scan (MB):")
-        max_file_label.set_halign(Gtk.Align.START)
-        self.max_file_spin = Gtk.SpinButton.new_with_range(1, 1000, 1)
-        
-        max_recursion_label = Gtk.Label("Maximum directory recursion depth:")
-        max_recursion_label.set_halign(Gtk.Align.START)
-        self.max_recursion_spin = Gtk.SpinButton.new_with_range(1, 50, 1)
-        
-        limits_grid.attach(max_file_label, 0, 0, 1, 1)
-        limits_grid.attach(self.max_file_spin, 1, 0, 1, 1)
-        limits_grid.attach(max_recursion_label, 0, 1, 1, 1)
-        limits_grid.attach(self.max_recursion_spin, 1, 1, 1, 1)
-        
-        limits_frame.add(limits_grid)
-        
-        box.pack_start(file_types_frame, False, False, 0)
-        box.pack_start(detection_frame, False, False, 0)
-        box.pack_start(limits_frame, False, False, 0)
-        
-        scrolled.add(box)
-        self.notebook.append_page(scrolled, Gtk.Label("Scan Options"))
-    
-    def create_realtime_tab(self):
-        """Create real-time protection tab"""
-        box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=12)
-        box.set_margin_left(12)
-        box.set_margin_right(12)
-        box.set_margin_top(12)
-        box.set_margin_bottom(12)
-        
-        # Real-time protection frame
-        realtime_frame = Gtk.Frame(label="Real-time Protection")
-        realtime_box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=6)
-        realtime_box.set_margin_left(12)
-        realtime_box.set_margin_right(12)
-        realtime_box.set_margin_top(12)
-        realtime_box.set_margin_bottom(12)
-        
-        self.realtime_enabled_check = Gtk.CheckButton.new_with_label("Enable real-time protection")
-        
-        # Warning label
-        warning_label = Gtk.Label()
-        warning_label.set_markup('<span color="red"><b>Warning:</b> Real-time protection requires root privileges and may impact system performance.</span>')
-        warning_label.set_line_wrap(True)
-        warning_label.set_halign(Gtk.Align.START)
-        
-        realtime_box.pack_start(self.realtime_enabled_check, False, False, 0)
-        realtime_box.pack_start(warning_label, False, False, 0)
-        realtime_frame.add(realtime_box)
-        
-        # Watch directories frame
-        watch_frame = Gtk.Frame(label="Directories to Monitor")
-        watch_box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=6)
-        watch_box.set_margin_left(12)
-        watch_box.set_margin_right(12)
-        watch_box.set_margin_top(12)
-        watch_box.set_margin_bottom(12)
-        
-        self.watch_downloads_check = Gtk.CheckButton.new_with_label("Monitor Downloads folder")
-        self.watch_home_check = Gtk.CheckButton.new_with_label("Monitor entire Home directory")
-        self.watch_removable_check = Gtk.CheckButton.new_with_label("Monitor removable devices")
-        self.prevention_mode_check = Gtk.CheckButton.new_with_label("Prevention mode (block infected files)")
-        
-        watch_box.pack_start(self.watch_downloads_check, False, False, 0)
-        watch_box.pack_start(self.watch_home_check, False, False, 0)
-        watch_box.pack_start(self.watch_removable_check, False, False, 0)
-        watch_box.pack_start(self.prevention_mode_check, False, False, 0)
-        
-        watch_frame.add(watch_box)
-        
-        box.pack_start(realtime_frame, False, False, 0)
-        box.pack_start(watch_frame, False, False, 0)
-        
-        self.notebook.append_page(box, Gtk.Label("Real-time"))
-    
-    def create_updates_tab(self):
-        """Create updates tab"""
-        box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=12)
-        box.set_margin_left(12)
-        box.set_margin_right(12)
-        box.set_margin_top(12)
-        box.set_margin_bottom(12)
-        
-        # Auto-update frame
-        update_frame = Gtk.Frame(label="Automatic Updates")
-        update_grid = Gtk.Grid()
-        update_grid.set_margin_left(12)
-        update_grid.set_margin_right(12)
-        update_grid.set_margin_top(12)
-        update_grid.set_margin_bottom(12)
-        update_grid.set_row_spacing(6)
-        update_grid.set_column_spacing(12)
-        
-        self.auto_update_check = Gtk.CheckButton.new_with_label("Enable automatic database updates")
-        
-        frequency_label = Gtk.Label("Update frequency:")
-        frequency_label.set_halign(Gtk.Align.START)
-        
-        self.frequency_combo = Gtk.ComboBoxText()
-        self.frequency_combo.append_text("Daily")
-        self.frequency_combo.append_text("Weekly")
-        self.frequency_combo.append_text("Manual only")
-        
-        self.check_startup_check = Gtk.CheckButton.new_with_label("Check for updates on startup")
-        
-        update_grid.attach(self.auto_update_check, 0, 0, 2, 1)
-        update_grid.attach(frequency_label, 0, 1, 1, 1)
-        update_grid.attach(self.frequency_combo, 1, 1, 1, 1)
-        update_grid.attach(self.check_startup_check, 0, 2, 2, 1)
-        
-        update_frame.add(update_grid)
-        box.pack_start(update_frame, False, False, 0)
-        
-        self.notebook.append_page(box, Gtk.Label("Updates"))
-    
-    def create_notifications_tab(self):
-        """Create notifications tab"""
-        box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=12)
-        box.set_margin_left(12)
-        box.set_margin_right(12)
-        box.set_margin_top(12)
-        box.set_margin_bottom(12)
-        
-        # Notifications frame
-        notif_frame = Gtk.Frame(label="Notification Settings")
-        notif_box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=6)
-        notif_box.set_margin_left(12)
-        notif_box.set_margin_right(12)
-        notif_box.set_margin_top(12)
-        notif_box.set_margin_bottom(12)
-        
-        self.show_scan_complete_check = Gtk.CheckButton.new_with_label("Show notification when scan completes")
-        self.show_threats_found_check = Gtk.CheckButton.new_with_label("Show notification when threats are found")
-        self.show_update_complete_check = Gtk.CheckButton.new_with_label("Show notification when database updates")
-        self.system_tray_check = Gtk.CheckButton.new_with_label("Show icon in system tray")
-        
-        notif_box.pack_start(self.show_scan_complete_check, False, False, 0)
-        notif_box.pack_start(self.show_threats_found_check, False, False, 0)
-        notif_box.pack_start(self.show_update_complete_check, False, False, 0)
-        notif_box.pack_start(self.system_tray_check, False, False, 0)
-        
-        notif_frame.add(notif_box)
-        box.pack_start(notif_frame, False, False, 0)
-        
-        self.notebook.append_page(box, Gtk.Label("Notifications"))
-    
-    def create_quarantine_tab(self):
-        """Create quarantine tab"""
-        box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=12)
-        box.set_margin_left(12)
-        box.set_margin_right(12)
-        box.set_margin_top(12)
-        box.set_margin_bottom(12)
-        
-        # Quarantine frame
-        quarantine_frame = Gtk.Frame(label="Quarantine Settings")
-        quarantine_grid = Gtk.Grid()
-        quarantine_grid.set_margin_left(12)
-        quarantine_grid.set_margin_right(12)
-        quarantine_grid.set_margin_top(12)
-        quarantine_grid.set_margin_bottom(12)
-        quarantine_grid.set_row_spacing(6)
-        quarantine_grid.set_column_spacing(12)
-        
-        self.auto_quarantine_check = Gtk.CheckButton.new_with_label("Automatically quarantine detected threats")
-        
-        path_label = Gtk.Label("Quarantine directory:")
-        path_label.set_halign(Gtk.Align.START)
-        
-        path_box = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=6)
-        self.quarantine_path_entry = Gtk.Entry()
-        browse_button = Gtk.Button.new_with_label("Browse...")
-        browse_button.connect("clicked", self.on_browse_quarantine_path)
-        
-        path_box.pack_start(self.quarantine_path_entry, True, True, 0)
-        path_box.pack_start(browse_button, False, False, 0)
-        
-        retention_label = Gtk.Label("Keep quarantined files for (days):")
-        retention_label.set_halign(Gtk.Align.START)
-        self.retention_spin = Gtk.SpinButton.new_with_range(1, 365, 1)
-        
-        quarantine_grid.attach(self.auto_quarantine_check, 0, 0, 2, 1)
-        quarantine_grid.attach(path_label, 0, 1, 1, 1)
-        quarantine_grid.attach(path_box, 1, 1, 1, 1)
-        quarantine_grid.attach(retention_label, 0, 2, 1, 1)
-        quarantine_grid.attach(self.retention_spin, 1, 2, 1, 1)
-        
-        quarantine_frame.add(quarantine_grid)
-        box.pack_start(quarantine_frame, False, False, 0)
-        
-        self.notebook.append_page(box, Gtk.Label("Quarantine"))
-    
-    def create_interface_tab(self):
-        """Create interface tab"""
-        box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=12)
-        box.set_margin_left(12)
-        box.set_margin_right(12)
-        box.set_margin_top(12)
-        box.set_margin_bottom(12)
-        
-        # Interface frame
-        interface_frame = Gtk.Frame(label="Interface Settings")
-        interface_grid = Gtk.Grid()
-        interface_grid.set_margin_left(12)
-        interface_grid.set_margin_right(12)
-        interface_grid.set_margin_top(12)
-        interface_grid.set_margin_bottom(12)
-        interface_grid.set_row_spacing(6)
-        interface_grid.set_column_spacing(12)
-        
-        self.start_minimized_check = Gtk.CheckButton.new_with_label("Start minimized to system tray")
-        self.close_to_tray_check = Gtk.CheckButton.new_with_label("Close to system tray instead of exit")
-        
-        theme_label = Gtk.Label("Theme:")
-        theme_label.set_halign(Gtk.Align.START)
-        
-        self.theme_combo = Gtk.ComboBoxText()
-        self.theme_combo.append_text("Auto (follow system)")
-        self.theme_combo.append_text("Light")
-        self.theme_combo.append_text("Dark")
-        
-        language_label = Gtk.Label("Language:")
-        language_label.set_halign(Gtk.Align.START)
-        
-        self.language_combo = Gtk.ComboBoxText()
-        self.language_combo.append_text("Auto (system default)")
-        self.language_combo.append_text("English")
-        self.language_combo.append_text("Hebrew")
-        self.language_combo.append_text("Spanish")
-        self.language_combo.append_text("French")
-        self.language_combo.append_text("German")
-        
-        interface_grid.attach(self.start_minimized_check, 0, 0, 2, 1)
-        interface_grid.attach(self.close_to_tray_check, 0, 1, 2, 1)
-        interface_grid.attach(theme_label, 0, 2, 1, 1)
-        interface_grid.attach(self.theme_combo, 1, 2, 1, 1)
-        interface_grid.attach(language_label, 0, 3, 1, 1)
-        interface_grid.attach(self.language_combo, 1, 3, 1, 1)
-        
-        interface_frame.add(interface_grid)
-        box.pack_start(interface_frame, False, False, 0)
-        
-        self.notebook.append_page(box, Gtk.Label("Interface"))
-    
-    def create_exclusions_tab(self):
-        """Create exclusions tab"""
-        box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=12)
-        box.set_margin_left(12)
-        box.set_margin_right(12)
-        box.set_margin_top(12)
-        box.set_margin_bottom(12)
-        
-        # Excluded paths frame
-        paths_frame = Gtk.Frame(label="Excluded Paths")
-        paths_box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=6)
-        paths_box.set_margin_left(12)
-        paths_box.set_margin_right(12)
-        paths_box.set_margin_top(12)
-        paths_box.set_margin_bottom(12)
-        
-        # Paths list
-        scrolled_paths = Gtk.ScrolledWindow()
-        scrolled_paths.set_policy(Gtk.PolicyType.AUTOMATIC, Gtk.PolicyType.AUTOMATIC)
-        scrolled_paths.set_size_request(-1, 150)
-        
-        self.paths_liststore = Gtk.ListStore(str)
-        self.paths_treeview = Gtk.TreeView(model=self.paths_liststore)
-        renderer = Gtk.CellRendererText()
-        column = Gtk.TreeViewColumn("Excluded Paths", renderer, text=0)
-        self.paths_treeview.append_column(column)
-        
-        scrolled_paths.add(self.paths_treeview)
-        
-        # Paths buttons
-        paths_button_box = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=6)
-        add_path_btn = Gtk.Button.new_with_label("Add Path")
-        add_path_btn.connect("clicked", self.on_add_excluded_path)
-        remove_path_btn = Gtk.Button.new_with_label("Remove")
-        remove_path_btn.connect("clicked", self.on_remove_excluded_path)
-        
-        paths_button_box.pack_start(add_path_btn, False, False, 0)
-        paths_button_box.pack_start(remove_path_btn, False, False, 0)
-        
-        paths_box.pack_start(scrolled_paths, True, True, 0)
-        paths_box.pack_start(paths_button_box, False, False, 0)
-        paths_frame.add(paths_box)
-        
-        # Excluded extensions frame
-        extensions_frame = Gtk.Frame(label="Excluded File Extensions")
-        extensions_box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=6)
-        extensions_box.set_margin_left(12)
-        extensions_box.set_margin_right(12)
-        extensions_box.set_margin_top(12)
-        extensions_box.set_margin_bottom(12)
-        
-        # Extensions list
-        scrolled_ext = Gtk.ScrolledWindow()
-        scrolled_ext.set_policy(Gtk.PolicyType.AUTOMATIC, Gtk.PolicyType.AUTOMATIC)
-        scrolled_ext.set_size_request(-1, 100)
-        
-        self.extensions_liststore = Gtk.ListStore(str)
-        self.extensions_treeview = Gtk.TreeView(model=self.extensions_liststore)
-        ext_renderer = Gtk.CellRendererText()
-        ext_column = Gtk.TreeViewColumn("Extensions", ext_renderer, text=0)
-        self.extensions_treeview.append_column(ext_column)
-        
-        scrolled_ext.add(self.extensions_treeview)
-        
-        # Extensions buttons
-        ext_button_box = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=6)
-        add_ext_btn = Gtk.Button.new_with_label("Add Extension")
-        add_ext_btn.connect("clicked", self.on_add_excluded_extension)
-        remove_ext_btn = Gtk.Button.new_with_label("Remove")
-        remove_ext_btn.connect("clicked", self.on_remove_excluded_extension)
-        
-        ext_button_box.pack_start(add_ext_btn, False, False, 0)
-        ext_button_box.pack_start(remove_ext_btn, False, False, 0)
-        
-        extensions_box.pack_start(scrolled_ext, True, True, 0)
-        extensions_box.pack_start(ext_button_box, False, False, 0)
-        extensions_frame.add(extensions_box)
-        
-        box.pack_start(paths_frame, True, True, 0)
-        box.pack_start(extensions_frame, True, True, 0)
-        
-        self.notebook.append_page(box, Gtk.Label("Exclusions"))
-    
-    def create_advanced_tab(self):
-        """Create advanced settings tab"""
-        box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=12)
-        box.set_margin_left(12)
-        box.set_margin_right(12)
-        box.set_margin_top(12)
-        box.set_margin_bottom(12)
-        
-        # Performance frame
-        performance_frame = Gtk.Frame(label="Performance Settings")
-        performance_grid = Gtk.Grid()
-        performance_grid.set_margin_left(12)
-        performance_grid.set_margin_right(12)
-        performance_grid.set_margin_top(12)
-        performance_grid.set_margin_bottom(12)
-        performance_grid.set_row_spacing(6)
-        performance_grid.set_column_spacing(12)
-        
-        threads_label = Gtk.Label("Scan threads:")
-        threads_label.set_halign(Gtk.Align.START)
-        self.threads_spin = Gtk.SpinButton.new_with_range(1, 16, 1)
-        
-        memory_label = Gtk.Label("Memory limit (MB):")
-        memory_label.set_halign(Gtk.Align.START)
-        self.memory_spin = Gtk.SpinButton.new_with_range(128, 4096, 64)
-        
-        performance_grid.attach(threads_label, 0, 0, 1, 1)
-        performance_grid.attach(self.threads_spin, 1, 0, 1, 1)
-        performance_grid.attach(memory_label, 0, 1, 1, 1)
-        performance_grid.attach(self.memory_spin, 1, 1, 1, 1)
-        
-        performance_frame.add(performance_grid)
-        
-        # Database frame
-        database_frame = Gtk.Frame(label="Database Settings")
-        database_grid = Gtk.Grid()
-        database_grid.set_margin_left(12)
-        database_grid.set_margin_right(12)
-        database_grid.set_margin_top(12)
-        database_grid.set_margin_bottom(12)
-        database_grid.set_row_spacing(6)
-        database_grid.set_column_spacing(12)
-        
-        mirror_label = Gtk.Label("Database mirror:")
-        mirror_label.set_halign(Gtk.Align.START)
-        
-        self.mirror_combo = Gtk.ComboBoxText()
-        self.mirror_combo.append_text("Auto (fastest)")
-        self.mirror_combo.append_text("Official (database.clamav.net)")
-        self.mirror_combo.append_text("Custom...")
-        
-        database_grid.attach(mirror_label, 0, 0, 1, 1)
-        database_grid.attach(self.mirror_combo, 1, 0, 1, 1)
-        
-        database_frame.add(database_grid)
-        
-        # Logging frame
-        logging_frame = Gtk.Frame(label="Logging Settings")
-        logging_grid = Gtk.Grid()
-        logging_grid.set_margin_left(12)
-        logging_grid.set_margin_right(12)
-        logging_grid.set_margin_top(12)
-        logging_grid.set_margin_bottom(12)
-        logging_grid.set_row_spacing(6)
-        logging_grid.set_column_spacing(12)
-        
-        log_level_label = Gtk.Label("Log level:")
-        log_level_label.set_halign(Gtk.Align.START)
-        
-        self.log_level_combo = Gtk.ComboBoxText()
-        self.log_level_combo.append_text("Debug")
-        self.log_level_combo.append_text("Info")
-        self.log_level_combo.append_text("Warning")
-        self.log_level_combo.append_text("Error")
-        
-        logging_grid.attach(log_level_label, 0, 0, 1, 1)
-        logging_grid.attach(self.log_level_combo, 1, 0, 1, 1)
-        
-        logging_frame.add(logging_grid)
-        
-        # Reset button
-        reset_button = Gtk.Button.new_with_label("Reset to Defaults")
-        reset_button.connect("clicked", self.on_reset_settings)
-        reset_button.set_halign(Gtk.Align.CENTER)
-        
-        box.pack_start(performance_frame, False, False, 0)
-        box.pack_start(database_frame, False, False, 0)
-        box.pack_start(logging_frame, False, False, 0)
-        box.pack_start(reset_button, False, False, 0)
-        
-        self.notebook.append_page(box, Gtk.Label("Advanced"))
-    
-    def load_current_settings(self):
-        """Load current settings into UI controls"""
-        # Scan options
-        scan_opts = self.settings.get("scan_options")
-        self.scan_archives_check.set_active(scan_opts.get("scan_archives", True))
-        self.scan_pdf_check.set_active(scan_opts.get("scan_pdf", True))
-        self.scan_ole2_check.set_active(scan_opts.get("scan_ole2", True))
-        self.scan_html_check.set_active(scan_opts.get("scan_html", True))
-        self.scan_pe_check.set_active(scan_opts.get("scan_pe", True))
-        self.scan_elf_check.set_active(scan_opts.get("scan_elf", True))
-        self.detect_pua_check.set_active(scan_opts.get("detect_pua", False))
-        self.scan_hidden_check.set_active(scan_opts.get("scan_hidden", False))
-        self.max_file_spin.set_value(scan_opts.get("max_file_size", 20))
-        self.max_recursion_spin.set_value(scan_opts.get("max_recursion", 15))
-        
-        # Real-time
-        realtime_opts = self.settings.get("real_time")
-        self.realtime_enabled_check.set_active(realtime_opts.get("enabled", False))
-        self.watch_downloads_check.set_active(realtime_opts.get("watch_downloads", True))
-        self.watch_home_check.set_active(realtime_opts.get("watch_home", False))
-        self.watch_removable_check.set_active(realtime_opts.get("watch_removable", True))
-        self.prevention_mode_check.set_active(realtime_opts.get("prevention_mode", False))
-        
-        # Updates
-        updates_opts = self.settings.get("updates")
-        self.auto_update_check.set_active(updates_opts.get("auto_update", True))
-        frequency = updates_opts.get("update_frequency", "daily")
-        freq_mapping = {"daily": 0, "weekly": 1, "manual": 2}
-        self.frequency_combo.set_active(freq_mapping.get(frequency, 0))
-        self.check_startup_check.set_active(updates_opts.get("check_on_startup", True))
-        
-        # Notifications
-        notif_opts = self.settings.get("notifications")
-        self.show_scan_complete_check.set_active(notif_opts.get("show_scan_complete", True))
-        self.show_threats_found_check.set_active(notif_opts.get("show_threats_found", True))
-        self.show_update_complete_check.set_active(notif_opts.get("show_update_complete", False))
-        self.system_tray_check.set_active(notif_opts.get("system_tray", True))
-        
-        # Quarantine
-        quarantine_opts = self.settings.get("quarantine")
-        self.auto_quarantine_check.set_active(quarantine_opts.get("auto_quarantine", True))
-        self.quarantine_path_entry.set_text(quarantine_opts.get("quarantine_path", ""))
-        self.retention_spin.set_value(quarantine_opts.get("retention_days", 30))
-        
-        # Interface
-        interface_opts = self.settings.get("interface")
-        self.start_minimized_check.set_active(interface_opts.get("start_minimized", False))
-        self.close_to_tray_check.set_active(interface_opts.get("close_to_tray", True))
-        
-        theme = interface_opts.get("dark_mode", "auto")
-        theme_mapping = {"auto": 0, "light": 1, "dark": 2}
-        self.theme_combo.set_active(theme_mapping.get(theme, 0))
-        
-        language = interface_opts.get("language", "auto")
-        lang_mapping = {"auto": 0, "en": 1, "he": 2, "es": 3, "fr": 4, "de": 5}
-        self.language_combo.set_active(lang_mapping.get(language, 0))
+        # Row labels of every page share one width
+        self._label_sg = Gtk.SizeGroup(mode=Gtk.SizeGroupMode.HORIZONTAL)
+        
+        # Pages are built on first display; start with empty placeholders
+        self._builder = Gtk.Builder()
+        self._built = set()
+        for title, section, extra_ids in _TABS:
+            self.notebook.append_page(Gtk.Box(orientation=Gtk.Orientation.VERTICAL), Gtk.Label(title))
+        self.notebook.connect("switch-page", self._on_switch_page)
+        self._build_page(0)
+    
+    def _on_switch_page(self, notebook, page, page_num):
+        """Build a page the first time it is shown"""
+        if page_num not in self._built:
+            self._build_page(page_num)
+    
+    def _build_page(self, page_num):
+        """Fill a placeholder page from settings.ui and load its settings"""
+        title, section, extra_ids = _TABS[page_num]
+        page_id = f"{section}_page"
+        self._builder.add_objects_from_file(_UI_FILE, [page_id, *extra_ids])
+        self._builder.connect_signals(self)
+        
+        # Expose named objects under their ids; GtkBuilder names the
+        # anonymous ones "___object_N___"
+        for obj in self._builder.get_objects():
+            if isinstance(obj, Gtk.Buildable):
+                name = Gtk.Buildable.get_name(obj)
+                if not name.startswith("___"):
+                    setattr(self, name, obj)
+        
+        tab = self._builder.get_object(page_id)
+        self._group_row_labels(tab)
+        placeholder = self.notebook.get_nth_page(page_num)
+        placeholder.pack_start(tab, True, True, 0)
+        tab.show_all()
+        if section == "scan_options":
+            self.clamd_note_label.set_visible(self._clamd_active)
+        self._built.add(page_num)
+        self.load_current_settings((section,))
+    
+    def _group_row_labels(self, container):
+        """Add the single-column labels of grid rows to the shared size group"""
+        for child in container.get_children():
+            if isinstance(child, Gtk.Label):
+                if isinstance(container, Gtk.Grid) and container.child_get_property(child, "width") == 1:
+                    self._label_sg.add_widget(child)
+            elif isinstance(child, Gtk.Container):
+                self._group_row_labels(child)
+    
+    def _built_sections(self):
+        """Settings sections whose pages have been built"""
+        return {_TABS[page_num][1] for page_num in self._built}
+    
+    def load_current_settings(self, sections=None):
+        """Load current settings into UI controls of built pages"""
+        if sections is None:
+            sections = self._built_sections()
+        
+        # Fetch each section once rather than per field
+        get = self.settings.get
+        opts = {section: get(section) for section in sections}
+        loaded = self._loaded
+        for section in opts:
+            loaded[section] = {}
+        for name, section, key, getter, setter, default in _FIELD_ACCESSORS:
+            section_opts = opts.get(section)
+            if section_opts is not None:
+                value = section_opts.get(key, default)
+                setter(getattr(self, name), value)
+                loaded[section][key] = value
         
         # Exclusions
-        exclusions = self.settings.get("exclusions")
-        for path in exclusions.get("paths", []):
-            self.paths_liststore.append([path])
-        for ext in exclusions.get("extensions", []):
-            self.extensions_liststore.append([ext])
-        
-        # Advanced
-        advanced_opts = self.settings.get("advanced")
-        self.threads_spin.set_value(advanced_opts.get("scan_threads", 4))
-        self.memory_spin.set_value(advanced_opts.get("memory_limit", 512))
-        
-        mirror = advanced_opts.get("database_mirror", "auto")
-        mirror_mapping = {"auto": 0, "official": 1, "custom": 2}
-        self.mirror_combo.set_active(mirror_mapping.get(mirror, 0))
-        
-        log_level = advanced_opts.get("log_level", "info")
-        log_mapping = {"debug": 0, "info": 1, "warning": 2, "error": 3}
-        self.log_level_combo.set_active(log_mapping.get(log_level, 1))
+        if "exclusions" in opts:
+            exclusions = opts["exclusions"]
+            if not isinstance(exclusions, dict):
+                exclusions = {}
+            paths = _str_list(exclusions.get("paths"))
+            extensions = _str_list(exclusions.get("extensions"))
+            self._fill_list(self.paths_treeview, self.paths_liststore, paths)
+            self._fill_list(self.extensions_treeview, self.extensions_liststore, extensions)
+            loaded["exclusions"].update(paths=paths, extensions=extensions)
+    
+    def _fill_list(self, treeview, liststore, values):
+        """Replace the rows of a single-column list in one batch"""
+        # Detach the model so the view doesn't react to every row
+        treeview.set_model(None)
+        liststore.freeze_notify()
+        try:
+            liststore.clear()
+            for value in values:
+                liststore.insert_with_valuesv(-1, [0], [value])
+        finally:
+            liststore.thaw_notify()
+            treeview.set_model(liststore)
     
     def save_current_settings(self):
         """Save UI settings back to settings object"""
-        # Scan options
-        self.settings.set("scan_options", "scan_archives", self.scan_archives_check.get_active())
-        self.settings.set("scan_options", "scan_pdf", self.scan_pdf_check.get_active())
-        self.settings.set("scan_options", "scan_ole2", self.scan_ole2_check.get_active())
-        self.settings.set("scan_options", "scan_html", self.scan_html_check.get_active())
-        self.settings.set("scan_options", "scan_pe", self.scan_pe_check.get_active())
-        self.settings.set("scan_options", "scan_elf", self.scan_elf_check.get_active())
-        self.settings.set("scan_options", "detect_pua", self.detect_pua_check.get_active())
-        self.settings.set("scan_options", "scan_hidden", self.scan_hidden_check.get_active())
-        self.settings.set("scan_options", "max_file_size", int(self.max_file_spin.get_value()))
-        self.settings.set("scan_options", "max_recursion", int(self.max_recursion_spin.get_value()))
-        
-        # Real-time
-        self.settings.set("real_time", "enabled", self.realtime_enabled_check.get_active())
-        self.settings.set("real_time", "watch_downloads", self.watch_downloads_check.get_active())
-        self.settings.set("real_time", "watch_home", self.watch_home_check.get_active())
-        self.settings.set("real_time", "watch_removable", self.watch_removable_check.get_active())
-        self.settings.set("real_time", "prevention_mode", self.prevention_mode_check.get_active())
-        
-        # Updates
-        self.settings.set("updates", "auto_update", self.auto_update_check.get_active())
-        freq_mapping = {0: "daily", 1: "weekly", 2: "manual"}
-        self.settings.set("updates", "update_frequency", freq_mapping[self.frequency_combo.get_active()])
-        self.settings.set("updates", "check_on_startup", self.check_startup_check.get_active())
-        
-        # Notifications
-        self.settings.set("notifications", "show_scan_complete", self.show_scan_complete_check.get_active())
-        self.settings.set("notifications", "show_threats_found", self.show_threats_found_check.get_active())
-        self.settings.set("notifications", "show_update_complete", self.show_update_complete_check.get_active())
-        self.settings.set("notifications", "system_tray", self.system_tray_check.get_active())
-        
-        # Quarantine
-        self.settings.set("quarantine", "auto_quarantine", self.auto_quarantine_check.get_active())
-        self.settings.set("quarantine", "quarantine_path", self.quarantine_path_entry.get_text())
-        self.settings.set("quarantine", "retention_days", int(self.retention_spin.get_value()))
-        
-        # Interface
-        self.settings.set("interface", "start_minimized", self.start_minimized_check.get_active())
-        self.settings.set("interface", "close_to_tray", self.close_to_tray_check.get_active())
-        
-        theme_mapping = {0: "auto", 1: "light", 2: "dark"}
-        self.settings.set("interface", "dark_mode", theme_mapping[self.theme_combo.get_active()])
-        
-        lang_mapping = {0: "auto", 1: "en", 2: "he", 3: "es", 4: "fr", 5: "de"}
-        self.settings.set("interface", "language", lang_mapping[self.language_combo.get_active()])
+        # Collect values per section and hand each section over in one
+        # call; pages never opened still hold their saved values
+        values = {section: {} for section in self._built_sections()}
+        for name, section, key, getter, setter, default in _FIELD_ACCESSORS:
+            section_values = values.get(section)
+            if section_values is not None:
+                section_values[key] = getter(getattr(self, name))
         
         # Exclusions
-        paths = []
-        for row in self.paths_liststore:
-            paths.append(row[0])
-        self.settings.set("exclusions", "paths", paths)
-        
-        extensions = []
-        for row in self.extensions_liststore:
-            extensions.append(row[0])
-        self.settings.set("exclusions", "extensions", extensions)
-        
-        # Advanced
-        self.settings.set("advanced", "scan_threads", int(self.threads_spin.get_value()))
-        self.settings.set("advanced", "memory_limit", int(self.memory_spin.get_value()))
-        
-        mirror_mapping = {0: "auto", 1: "official", 2: "custom"}
-        self.settings.set("advanced", "database_mirror", mirror_mapping[self.mirror_combo.get_active()])
-        
-        log_mapping = {0: "debug", 1: "info", 2: "warning", 3: "error"}
-        self.settings.set("advanced", "log_level", log_mapping[self.log_level_combo.get_active()])
+        if "exclusions" in values:
+            values["exclusions"]["paths"] = [row[0] for row in self.paths_liststore]
+            values["exclusions"]["extensions"] = [row[0] for row in self.extensions_liststore]
+        
+        # Only hand over what differs from the values the page was loaded with
+        loaded = self._loaded
+        settings = self.settings
+        with settings.batch():
+            update_section = settings.update_section
+            for section, section_values in values.items():
+                old = loaded.setdefault(section, {})
+                changed = {key: value for key, value in section_values.items()
+                           if key not in old or old[key] != value}
+                if changed:
+                    update_section(section, changed)
+                    old.update(changed)
     
     def on_browse_quarantine_path(self, button):
         """Browse for quarantine directory"""
@@ -915,56 +674,118 @@ class SettingsDialog(Gtk.Dialog):
         response = dialog.run()
         if response == Gtk.ResponseType.YES:
             # Reset settings to defaults
-            self.settings.settings = self.settings.default_settings.copy()
-            self.settings.save_settings()
-            
-            # Clear lists
-            self.paths_liststore.clear()
-            self.extensions_liststore.clear()
+            self.settings.reset()
             
             # Reload UI
             self.load_current_settings()
         
         dialog.destroy()
 
+# Each quarantined file has a "<name>.info" JSON record beside it
+_INFO_SUFFIX = ".info"
+
+def _entry_paths(payload):
+    """(payload, info record) path strings of a quarantined file"""
+    payload = os.fspath(payload)
+    return payload, payload + _INFO_SUFFIX
+
+def _remove_entry(entry):
+    """Unlink both files of a quarantine entry, ignoring ones already gone"""
+    for path in entry:
+        try:
+            os.unlink(path)
+        except FileNotFoundError:
+            pass
+
 class QuarantineManager:
     """Manage quarantined files"""
     
+    # Directories already created by this process
+    _ENSURED = set()
+    
     def __init__(self, settings):
         self.settings = settings
         self.quarantine_path = Path(settings.get("quarantine", "quarantine_path"))
         self.ensure_quarantine_dir()
+        # Keeps names unique when several files are quarantined within a second
+        self._counter = itertools.count()
+        # Info records are written by a background thread so quarantining
+        # returns right after the rename. The thread only runs while records
+        # are queued and is not a daemon, so exiting waits for it to finish.
+        self._info_pending = collections.deque()
+        self._info_done = threading.Condition()
+        self._info_thread = None
+    
+    def _queue_info(self, info_file, info):
+        """Queue an info record, starting the writer thread if it is idle"""
+        with self._info_done:
+            self._info_pending.append((info_file, info))
+            if self._info_thread is None:
+                self._info_thread = threading.Thread(target=self._info_writer, name="xclamav-quarantine-info")
+                self._info_thread.start()
+    
+    def _info_writer(self):
+        """Write queued info records to disk until none are left"""
+        while True:
+            with self._info_done:
+                if not self._info_pending:
+                    self._info_thread = None
+                    self._info_done.notify_all()
+                    return
+                info_file, info = self._info_pending.popleft()
+            try:
+                data = _json_dumps(info)
+                fd = os.open(info_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+                try:
+                    _write_all(fd, data)
+                finally:
+                    os.close(fd)
+            except Exception as e:
+                _log.warning("writing quarantine info %s failed: %s", info_file, e)
+    
+    def wait_pending(self):
+        """Block until every queued info record has been written"""
+        with self._info_done:
+            self._info_done.wait_for(lambda: self._info_thread is None)
     
     def ensure_quarantine_dir(self):
         """Ensure quarantine directory exists"""
-        self.quarantine_path.mkdir(parents=True, exist_ok=True)
+        path = str(self.quarantine_path)
+        if path not in QuarantineManager._ENSURED:
+            self.quarantine_path.mkdir(parents=True, exist_ok=True)
+            QuarantineManager._ENSURED.add(path)
     
     def quarantine_file(self, source_path, threat_name):
         """Move file to quarantine"""
         try:
             source = Path(source_path)
-            if not source.exists():
-                return False
             
             # Create unique filename with timestamp
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            quarantine_name = f"{timestamp}_{source.name}_{threat_name}"
-            quarantine_file = self.quarantine_path / quarantine_name
+            timestamp = time.strftime("%Y%m%d_%H%M%S")
+            quarantine_name = f"{timestamp}_{next(self._counter)}_{source.name}_{threat_name}"
+            quarantine_file, info_file = _entry_paths(self.quarantine_path / quarantine_name)
             
-            # Move file to quarantine
-            source.rename(quarantine_file)
+            # Move file to quarantine. ENOENT means either the source is
+            # already gone or the quarantine directory was removed after it
+            # was first ensured; recreate the directory and retry once.
+            try:
+                source.rename(quarantine_file)
+            except FileNotFoundError:
+                if not os.path.lexists(source):
+                    return False
+                QuarantineManager._ENSURED.discard(str(self.quarantine_path))
+                self.ensure_quarantine_dir()
+                source.rename(quarantine_file)
             
             # Create info file
-            info_file = quarantine_file.with_suffix('.info')
             info = {
                 "original_path": str(source),
                 "threat_name": threat_name,
                 "quarantine_date": timestamp,
-                "file_size": quarantine_file.stat().st_size
+                "file_size": os.stat(quarantine_file).st_size
             }
             
-            with open(info_file, 'w') as f:
-                json.dump(info, f, indent=2)
+            self._queue_info(info_file, info)
             
             return True
             
@@ -975,16 +796,29 @@ class QuarantineManager:
     def list_quarantined_files(self):
         """List all quarantined files"""
         quarantined = []
+        self.wait_pending()
         
-        for info_file in self.quarantine_path.glob("*.info"):
+        # One directory scan answers every "does the payload exist" check
+        try:
+            with os.scandir(self.quarantine_path) as entries:
+                names = {entry.name for entry in entries}
+        except OSError as e:
+            _log.warning("reading quarantine directory failed: %s", e)
+            return quarantined
+        
+        directory = str(self.quarantine_path)
+        for name in names:
+            if not name.endswith(_INFO_SUFFIX):
+                continue
+            if name[:-len(_INFO_SUFFIX)] not in names:
+                continue
+            payload, info_file = _entry_paths(os.path.join(directory, name[:-len(_INFO_SUFFIX)]))
             try:
-                with open(info_file, 'r') as f:
-                    info = json.load(f)
+                with open(info_file, 'rb') as f:
+                    info = _json_loads(f.read())
                 
-                quarantine_file = info_file.with_suffix('')
-                if quarantine_file.exists():
-                    info['quarantine_file'] = str(quarantine_file)
-                    quarantined.append(info)
+                info['quarantine_file'] = payload
+                quarantined.append(info)
                     
             except Exception as e:
                 print(f"Error reading quarantine info: {e}")
@@ -993,20 +827,19 @@ class QuarantineManager:
     
     def restore_file(self, quarantine_file, original_path):
         """Restore file from quarantine"""
+        self.wait_pending()
         try:
-            qfile = Path(quarantine_file)
+            payload, info_file = _entry_paths(quarantine_file)
             original = Path(original_path)
             
             # Ensure original directory exists
             original.parent.mkdir(parents=True, exist_ok=True)
             
             # Move file back
-            qfile.rename(original)
+            os.rename(payload, original)
             
             # Remove info file
-            info_file = qfile.with_suffix('.info')
-            if info_file.exists():
-                info_file.unlink()
+            _remove_entry((info_file,))
             
             return True
             
@@ -1016,15 +849,9 @@ class QuarantineManager:
     
     def delete_quarantined_file(self, quarantine_file):
         """Permanently delete quarantined file"""
+        self.wait_pending()
         try:
-            qfile = Path(quarantine_file)
-            info_file = qfile.with_suffix('.info')
-            
-            if qfile.exists():
-                qfile.unlink()
-            if info_file.exists():
-                info_file.unlink()
-            
+            _remove_entry(_entry_paths(quarantine_file))
             return True
             
         except Exception as e:
@@ -1034,18 +861,23 @@ class QuarantineManager:
     def cleanup_old_files(self):
         """Clean up old quarantined files based on retention policy"""
         retention_days = self.settings.get("quarantine", "retention_days")
-        cutoff_date = datetime.now() - timedelta(days=retention_days)
+        cutoff_ts = time.time() - retention_days * 86400
+        self.wait_pending()
         
-        for info_file in self.quarantine_path.glob("*.info"):
+        # DirEntry.stat() reuses what the directory scan already fetched
+        try:
+            with os.scandir(self.quarantine_path) as entries:
+                expired = [_entry_paths(entry.path[:-len(_INFO_SUFFIX)]) for entry in entries
+                           if entry.name.endswith(_INFO_SUFFIX)
+                           and entry.stat().st_mtime < cutoff_ts]
+        except OSError as e:
+            _log.warning("quarantine cleanup failed: %s", e)
+            return
+        
+        for entry in expired:
             try:
-                # Check file modification time
-                file_time = datetime.fromtimestamp(info_file.stat().st_mtime)
-                
-                if file_time < cutoff_date:
-                    quarantine_file = info_file.with_suffix('')
-                    self.delete_quarantined_file(str(quarantine_file))
-                    
-            except Exception as e:
+                _remove_entry(entry)
+            except OSError as e:
                 print(f"Error during cleanup: {e}")
 
 # Example usage
@@ -8,12 +8,19 @@ import gi
 gi.require_version('Gtk', '3.0')
 gi.require_version('XApp', '1.0')
 from gi.repository import Gtk, Gio, GLib, XApp
+import logging
 import os
+import re
+import selectors
+import shutil
+import socket
 import sys
 import subprocess
 import threading
 import time
-from datetime import datetime
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
 
 # Import settings module
 try:
@@ -23,104 +30,269 @@ except ImportError:
     XClamAVSettings = None
     SettingsDialog = None
 
+_HOME = str(Path.home())
+
+# Local sockets clamd listens on in common distribution layouts
+_CLAMD_SOCKETS = ("/var/run/clamav/clamd.ctl", "/run/clamav/clamd.ctl", "/run/clamd.scan/clamd.sock")
+
+def _now_str():
+    """Current local time formatted as YYYY-MM-DD HH:MM:SS"""
+    # Only needed once a scan runs, so keep it off the startup path
+    from datetime import datetime
+    return datetime.now().isoformat(sep=' ', timespec='seconds')
+
+# Top-level directories holding kernel and runtime pseudo-filesystems
+_VIRTUAL_ROOT_DIRS = frozenset(('proc', 'sys', 'dev', 'run'))
+
+# Kernel and packaging filesystems clamscan should not descend into.
+# tmpfs stays scanned: /tmp is a common place to drop files.
+_VIRTUAL_FS_TYPES = frozenset((
+    'proc', 'sysfs', 'devtmpfs', 'devpts', 'cgroup', 'cgroup2', 'securityfs',
+    'debugfs', 'tracefs', 'pstore', 'bpf', 'configfs', 'fusectl', 'mqueue',
+    'hugetlbfs', 'binfmt_misc', 'efivarfs', 'fuse.lxcfs', 'overlay',
+    'squashfs',
+))
+
+# autofs is only the automount trigger; the real filesystem (an EFI /boot,
+# NFS homes) is mounted on or below the same path. Such a trigger is only
+# skipped while idle, so a full scan does not mount every share it passes.
+_AUTOFS = 'autofs'
+
+def _virtual_mountpoints():
+    """Outermost mountpoints of pseudo-filesystems, sorted"""
+    try:
+        with open('/proc/mounts') as f:
+            mounts = f.read().splitlines()
+    except OSError:
+        return []
+    
+    mountpoints = []
+    triggers = []
+    others = []
+    for line in mounts:
+        fields = line.split()
+        if len(fields) < 3 or fields[1] == '/':
+            continue
+        # /proc/mounts escapes whitespace and backslashes as octal
+        mountpoint = re.sub(r'\\([0-7]{3})', lambda m: chr(int(m[1], 8)), fields[1])
+        if fields[2] in _VIRTUAL_FS_TYPES:
+            mountpoints.append(mountpoint)
+        elif fields[2] == _AUTOFS:
+            triggers.append(mountpoint)
+        else:
+            others.append(mountpoint)
+    
+    for trigger in triggers:
+        if not any(other == trigger or other.startswith(trigger + '/')
+                   for other in others):
+            mountpoints.append(trigger)
+    
+    # Mounts nested under another one are skipped along with it
+    outermost = []
+    covered = None
+    for mountpoint in sorted(set(mountpoints)):
+        if covered and (mountpoint + '/').startswith(covered):
+            continue
+        covered = mountpoint + '/'
+        outermost.append(mountpoint)
+    return outermost
+
+def _virtual_mount_excludes(targets):
+    """clamscan --exclude-dir options for pseudo-filesystems under targets"""
+    excludes = []
+    for mountpoint in _virtual_mountpoints():
+        # clamscan applies --exclude-dir to the targets themselves, so a
+        # mount that is or holds a target would skip that target entirely
+        if any(target == mountpoint or target.startswith(mountpoint + '/')
+               for target in targets):
+            continue
+        pattern = re.sub(r'([.\[\]()*+?{}|^$\\])', r'\\\1', mountpoint)
+        excludes.append(f'--exclude-dir=^{pattern}(/|$)')
+    return excludes
+
+def _paths_outside(directory, mountpoints):
+    """Entries of directory, descending only where a mountpoint lies below"""
+    prefix = directory.rstrip('/') + '/'
+    if not any(mountpoint.startswith(prefix) for mountpoint in mountpoints):
+        return [directory]
+    try:
+        with os.scandir(directory) as entries:
+            entries = sorted(entries, key=lambda entry: entry.name)
+    except OSError:
+        return [directory]
+    
+    paths = []
+    for entry in entries:
+        if entry.path in mountpoints:
+            continue
+        if entry.is_dir(follow_symlinks=False):
+            paths += _paths_outside(entry.path, mountpoints)
+        elif not entry.is_symlink():
+            paths.append(entry.path)
+    return paths
+
+# Python opens descriptors non-inheritable and GLib sets close-on-exec on
+# its own, so on Linux children can skip closing every descriptor; with that
+# and an absolute executable path subprocess starts them with posix_spawn
+_CLOSE_FDS = sys.platform != 'linux'
+
+# Scan output reaches the GUI in batches of up to this many lines, or
+# after this many seconds, whichever comes first
+_PROGRESS_BATCH = 32
+_PROGRESS_INTERVAL = 0.05
+
+# Oldest lines are dropped from the output view beyond this many
+_MAX_OUTPUT_LINES = 5000
+
+# Snapshot of the scan options a command is built from, with their defaults
+_ScanOpts = namedtuple('_ScanOpts', (
+    'scan_archives', 'scan_pdf', 'scan_ole2', 'scan_html', 'scan_pe', 'scan_elf',
+    'detect_pua', 'scan_hidden', 'max_file_size', 'max_recursion',
+), defaults=(True, True, True, True, True, True, False, False, 20, 15))
+
 class ClamAVWrapper:
     """Wrapper class for ClamAV commands"""
     
+    # Yes/no clamscan switches as (scan option, flag)
+    _SCAN_FLAGS = (
+        ('scan_archives', '--scan-archive'),
+        ('scan_pdf', '--scan-pdf'),
+        ('scan_ole2', '--scan-ole2'),
+        ('scan_html', '--scan-html'),
+        ('scan_pe', '--scan-pe'),
+        ('scan_elf', '--scan-elf'),
+        ('detect_pua', '--detect-pua'),
+    )
+    _STANDARD_ARGS = ('--recursive', '--infected', '--bell')
+    
     def __init__(self):
         self.scanning = False
         self.scan_process = None
         self.scan_options = {}
+        self._opts = _ScanOpts()
+        self._argv_template = self._build_argv_template()
+        self._clamd_available = None
+        self._installed_cache = None
+        # Scans run one at a time on a reused worker thread
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='xclamav')
         
     def set_scan_options(self, options):
         """Set scan options from settings"""
         self.scan_options = options
-        
+        self._opts = _ScanOpts(**{key: options[key] for key in _ScanOpts._fields if key in options})
+        self._argv_template = self._build_argv_template()
+        
+    def is_clamd_available(self):
+        """Check if clamdscan is installed and a clamd daemon accepts connections"""
+        if self._clamd_available is None:
+            self._clamd_available = False
+            if shutil.which('clamdscan'):
+                for path in _CLAMD_SOCKETS:
+                    try:
+                        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+                            sock.settimeout(1)
+                            sock.connect(path)
+                        self._clamd_available = True
+                        break
+                    except OSError:
+                        continue
+        return self._clamd_available
+    
     def is_clamav_installed(self):
         """Check if ClamAV is installed"""
+        if self._installed_cache is None:
+            self._installed_cache = bool(self.is_clamd_available() or shutil.which('clamscan'))
+        return self._installed_cache
+    
+    def invalidate_install_cache(self):
+        """Forget cached installation and daemon checks"""
+        self._installed_cache = None
+        self._clamd_available = None
+    
+    def full_scan_targets(self):
+        """Paths a full system scan covers"""
+        if not self.is_clamd_available():
+            return '/'
+        # Hand clamd every real top-level directory at once so its worker
+        # pool spreads them over its threads; symlinks such as /bin -> usr/bin
+        # would only scan the same tree twice
         try:
-            subprocess.run(['clamscan', '--version'], 
-                         capture_output=True, check=True)
-            return True
-        except (subprocess.CalledProcessError, FileNotFoundError):
-            return False
+            with os.scandir('/') as entries:
+                top = sorted(entry.path for entry in entries
+                             if entry.name not in _VIRTUAL_ROOT_DIRS
+                             and entry.is_dir(follow_symlinks=False))
+        except OSError:
+            return '/'
+        
+        # clamdscan has no --exclude-dir, so list the paths around squashfs
+        # and overlay mounts such as /snap/* or /var/lib/docker instead
+        mountpoints = set(_virtual_mountpoints())
+        targets = []
+        for path in top:
+            if path not in mountpoints:
+                targets += _paths_outside(path, mountpoints)
+        return targets
     
-    def build_scan_command(self, path):
+    def build_scan_command(self, path, full_scan=False):
         """Build clamscan command with current options"""
-        cmd = ['clamscan']
-        
-        # Apply scan options
-        if self.scan_options.get('scan_archives', True):
-            cmd.append('--scan-archive=yes')
-        else:
-            cmd.append('--scan-archive=no')
-            
-        if self.scan_options.get('scan_pdf', True):
-            cmd.append('--scan-pdf=yes')
-        else:
-            cmd.append('--scan-pdf=no')
-            
-        if self.scan_options.get('scan_ole2', True):
-            cmd.append('--scan-ole2=yes')
-        else:
-            cmd.append('--scan-ole2=no')
-            
-        if self.scan_options.get('scan_html', True):
-            cmd.append('--scan-html=yes')
-        else:
-            cmd.append('--scan-html=no')
-            
-        if self.scan_options.get('scan_pe', True):
-            cmd.append('--scan-pe=yes')
-        else:
-            cmd.append('--scan-pe=no')
-            
-        if self.scan_options.get('scan_elf', True):
-            cmd.append('--scan-elf=yes')
-        else:
-            cmd.append('--scan-elf=no')
-            
-        if self.scan_options.get('detect_pua', False):
-            cmd.append('--detect-pua=yes')
-        else:
-            cmd.append('--detect-pua=no')
-            
-        if not self.scan_options.get('scan_hidden', False):
+        paths = [path] if isinstance(path, str) else list(path)
+        
+        # The daemon keeps the signature database loaded between scans and
+        # scans with its own worker threads; it takes its scan options from
+        # clamd.conf rather than the command line
+        if self.is_clamd_available():
+            return [shutil.which('clamdscan') or 'clamdscan',
+                    '--fdpass', '--multiscan', '--infected', *paths]
+        
+        # Pseudo-filesystems are only skipped when scanning the whole system
+        excludes = _virtual_mount_excludes(paths) if full_scan else []
+        return [*self._argv_template, *excludes, *paths]
+    
+    def _build_argv_template(self):
+        """clamscan arguments for the current options, without the paths"""
+        opts = self._opts
+        cmd = [shutil.which('clamscan') or 'clamscan']
+        cmd += [f"{flag}={'yes' if getattr(opts, key) else 'no'}"
+                for key, flag in self._SCAN_FLAGS]
+        if not opts.scan_hidden:
             cmd.append('--exclude-dir=^\\.')
         
-        # Add file size limit
-        max_size = self.scan_options.get('max_file_size', 20)
-        cmd.append(f'--max-filesize={max_size}M')
-        
-        # Add recursion limit
-        max_recursion = self.scan_options.get('max_recursion', 15)
-        cmd.append(f'--max-dir-recursion={max_recursion}')
-        
-        # Standard options
-        cmd.extend(['--recursive', '--infected', '--bell', path])
+        # Size and recursion limits, then the standard options
+        cmd += [
+            f"--max-filesize={opts.max_file_size}M",
+            f"--max-dir-recursion={opts.max_recursion}",
+            *self._STANDARD_ARGS,
+        ]
         
-        return cmd
+        return tuple(cmd)
     
     def update_database(self, callback=None):
         """Update ClamAV virus database"""
-        def run_update():
-            try:
-                process = subprocess.Popen(['sudo', 'freshclam'], 
-                                         stdout=subprocess.PIPE, 
-                                         stderr=subprocess.PIPE,
-                                         universal_newlines=True)
-                stdout, stderr = process.communicate()
-                if callback:
-                    GLib.idle_add(callback, process.returncode == 0, stdout, stderr)
-            except Exception as e:
-                if callback:
-                    GLib.idle_add(callback, False, "", str(e))
+        # pkexec asks for authorization through the desktop's polkit agent,
+        # and GIO reports completion on the main loop without a thread
+        try:
+            process = Gio.Subprocess.new(
+                ['pkexec', 'freshclam'],
+                Gio.SubprocessFlags.STDOUT_PIPE | Gio.SubprocessFlags.STDERR_PIPE
+            )
+        except GLib.Error as e:
+            if callback:
+                GLib.idle_add(callback, False, "", e.message)
+            return
         
-        thread = threading.Thread(target=run_update)
-        thread.daemon = True
-        thread.start()
+        def on_finished(process, result):
+            try:
+                _, stdout, stderr = process.communicate_utf8_finish(result)
+                success = process.get_successful()
+            except GLib.Error as e:
+                success, stdout, stderr = False, "", e.message
+            if callback:
+                callback(success, stdout or "", stderr or "")
+        
+        process.communicate_utf8_async(None, None, on_finished)
     
-    def scan_path(self, path, callback=None, progress_callback=None):
-        """Scan a specific path"""
+    def scan_path(self, path, callback=None, progress_callback=None, full_scan=False):
+        """Scan a specific path, or a list of paths in one run"""
         if self.scanning:
             return False
             
@@ -128,32 +300,82 @@ class ClamAVWrapper:
         
         def run_scan():
             try:
-                cmd = self.build_scan_command(path)
-                self.scan_process = subprocess.Popen(
+                cmd = self.build_scan_command(path, full_scan)
+                process = self.scan_process = subprocess.Popen(
                     cmd, 
                     stdout=subprocess.PIPE, 
-                    stderr=subprocess.PIPE,
-                    universal_newlines=True
+                    stderr=subprocess.STDOUT,
+                    bufsize=0,
+                    close_fds=_CLOSE_FDS
                 )
                 
                 output_lines = []
-                while True:
-                    output = self.scan_process.stdout.readline()
-                    if output == '' and self.scan_process.poll() is not None:
-                        break
-                    if output:
-                        output_lines.append(output.strip())
-                        if progress_callback:
-                            GLib.idle_add(progress_callback, output.strip())
                 
-                stderr = self.scan_process.stderr.read()
-                returncode = self.scan_process.returncode
+                # Batches the GUI hasn't picked up yet are merged, so a busy
+                # main loop gets one callback rather than a queue of them
+                pending = []
+                pending_lock = threading.Lock()
+                
+                def deliver():
+                    with pending_lock:
+                        lines = pending[:]
+                        pending.clear()
+                    progress_callback(lines)
+                    return False
+                
+                def emit(data):
+                    # Lines stay bytes until a batch is handed over
+                    lines = [line.strip() for line in data.decode('utf-8', 'replace').split('\n')]
+                    output_lines.extend(lines)
+                    if progress_callback:
+                        with pending_lock:
+                            idle = not pending
+                            pending.extend(lines)
+                        if idle:
+                            GLib.idle_add(deliver)
+                
+                # Read whole chunks off the pipe and hand lines over in batches
+                fd = process.stdout.fileno()
+                os.set_blocking(fd, False)
+                buffer = bytearray()
+                complete = 0        # end of the last full line in buffer
+                line_count = 0
+                last_emit = time.monotonic()
+                with selectors.DefaultSelector() as selector:
+                    selector.register(fd, selectors.EVENT_READ)
+                    while True:
+                        if selector.select(_PROGRESS_INTERVAL):
+                            try:
+                                chunk = os.read(fd, 65536)
+                            except BlockingIOError:
+                                continue
+                            if not chunk:
+                                break
+                            buffer += chunk
+                            end = buffer.rfind(b'\n') + 1
+                            if end > complete:
+                                line_count += buffer.count(b'\n', complete, end)
+                                complete = end
+                        now = time.monotonic()
+                        if line_count and (line_count >= _PROGRESS_BATCH or now - last_emit >= _PROGRESS_INTERVAL):
+                            emit(buffer[:complete - 1])
+                            del buffer[:complete]
+                            complete = line_count = 0
+                            last_emit = now
+                
+                # Whatever is left, including a last line without a newline
+                if buffer:
+                    emit(buffer[:-1] if buffer.endswith(b'\n') else buffer)
+                
+                # Warnings arrive interleaved with the output above
+                returncode = process.wait()
+                error = "" if returncode == 0 else f"{os.path.basename(cmd[0])} exited with status {returncode}"
                 
                 self.scanning = False
                 self.scan_process = None
                 
                 if callback:
-                    GLib.idle_add(callback, returncode == 0, '\n'.join(output_lines), stderr)
+                    GLib.idle_add(callback, returncode == 0, '\n'.join(output_lines), error)
                     
             except Exception as e:
                 self.scanning = False
@@ -161,9 +383,7 @@ class ClamAVWrapper:
                 if callback:
                     GLib.idle_add(callback, False, "", str(e))
         
-        thread = threading.Thread(target=run_scan)
-        thread.daemon = True
-        thread.start()
+        self._executor.submit(run_scan)
         return True
     
     def stop_scan(self):
@@ -172,6 +392,11 @@ class ClamAVWrapper:
             self.scan_process.terminate()
             self.scanning = False
             self.scan_process = None
+    
+    def shutdown(self):
+        """Stop any running scan and release the worker thread"""
+        self.stop_scan()
+        self._executor.shutdown(wait=False, cancel_futures=True)
 
 class XClamAVWindow(Gtk.ApplicationWindow):
     """Main application window"""
@@ -181,6 +406,9 @@ class XClamAVWindow(Gtk.ApplicationWindow):
         
         self.clamav = ClamAVWrapper()
         self.scan_results = []
+        self._scroll_source = 0
+        self._last_progress = 0.0
+        self.pulse_timer = 0
         
         # Initialize settings
         if XClamAVSettings:
@@ -202,6 +430,8 @@ class XClamAVWindow(Gtk.ApplicationWindow):
         self.check_clamav_status()
         self.apply_settings()
         
+        self.connect("destroy", self.on_destroy)
+        
     def setup_ui(self):
         """Setup the user interface"""
         # Main container
@@ -368,21 +598,36 @@ class XClamAVWindow(Gtk.ApplicationWindow):
     
     def append_output(self, text):
         """Append text to output buffer"""
-        end_iter = self.output_buffer.get_end_iter()
-        self.output_buffer.insert(end_iter, text + "\n")
-        
-        # Auto-scroll to bottom
+        self.append_output_batch((text,))
+    
+    def append_output_batch(self, lines):
+        """Append several lines to output buffer with a single insert"""
+        buffer = self.output_buffer
+        buffer.insert(buffer.get_end_iter(), "\n".join(lines) + "\n")
+        
+        # Drop the oldest lines so long scans don't grow the buffer without bound
+        excess = buffer.get_line_count() - 1 - _MAX_OUTPUT_LINES
+        if excess > 0:
+            buffer.delete(buffer.get_start_iter(), buffer.get_iter_at_line(excess))
+        
+        # Auto-scroll to bottom once pending inserts and redraws are done
+        if not self._scroll_source:
+            self._scroll_source = GLib.idle_add(self._scroll_output, priority=GLib.PRIORITY_LOW)
+    
+    def _scroll_output(self):
+        """Scroll the output view to its last line"""
+        self._scroll_source = 0
         mark = self.output_buffer.get_insert()
         self.output_textview.scroll_mark_onscreen(mark)
+        return False
     
     def on_quick_scan(self, button):
         """Quick scan (home directory)"""
-        home_dir = os.path.expanduser("~")
-        self.start_scan("Quick Scan", home_dir)
+        self.start_scan("Quick Scan", _HOME)
     
     def on_full_scan(self, button):
         """Full system scan"""
-        self.start_scan("Full System Scan", "/")
+        self.start_scan("Full System Scan", "/", self.clamav.full_scan_targets(), full_scan=True)
     
     def on_custom_scan(self, button):
         """Custom directory scan"""
@@ -403,11 +648,13 @@ class XClamAVWindow(Gtk.ApplicationWindow):
         
         dialog.destroy()
     
-    def start_scan(self, scan_type, path):
-        """Start a scan operation"""
+    def start_scan(self, scan_type, path, targets=None, full_scan=False):
+        """Start a scan operation; targets overrides what is actually scanned"""
         self.output_buffer.set_text("")
         self.append_output(f"Starting {scan_type} of: {path}")
-        self.append_output(f"Scan started at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+        self.append_output(f"Scan started at: {_now_str()}")
+        if self.clamav.is_clamd_available():
+            self.append_output("Scanning with clamd; scan options come from clamd.conf, not from Settings")
         self.append_output("-" * 50)
         
         self.progress_bar.set_text(f"Scanning: {scan_type}")
@@ -417,32 +664,39 @@ class XClamAVWindow(Gtk.ApplicationWindow):
         self.enable_scan_buttons(False)
         self.stop_scan_btn.set_sensitive(True)
         
-        # Start pulse animation
-        self.pulse_timer = GLib.timeout_add(100, self.pulse_progress)
+        # Keep the bar moving while the scanner is quiet; output pulses it too
+        self._last_progress = time.monotonic()
+        self.pulse_timer = GLib.timeout_add(500, self.pulse_progress)
         
         # Start scan
         self.clamav.scan_path(
-            path,
+            targets or path,
             callback=self.on_scan_complete,
-            progress_callback=self.on_scan_progress
+            progress_callback=self.on_scan_progress,
+            full_scan=full_scan
         )
     
     def pulse_progress(self):
-        """Pulse progress bar"""
+        """Pulse progress bar if no output arrived recently"""
         if self.clamav.scanning:
-            self.progress_bar.pulse()
+            if time.monotonic() - self._last_progress >= 0.5:
+                self.progress_bar.pulse()
             return True
+        self.pulse_timer = 0
         return False
     
-    def on_scan_progress(self, line):
-        """Handle scan progress updates"""
-        self.append_output(line)
+    def on_scan_progress(self, lines):
+        """Handle a batch of scan output lines"""
+        self.append_output_batch(lines)
+        self.progress_bar.pulse()
+        self._last_progress = time.monotonic()
     
     def on_scan_complete(self, success, output, error):
         """Handle scan completion"""
         # Stop pulse timer
-        if hasattr(self, 'pulse_timer'):
+        if self.pulse_timer:
             GLib.source_remove(self.pulse_timer)
+            self.pulse_timer = 0
         
         self.append_output("-" * 50)
         if success:
@@ -454,10 +708,11 @@ class XClamAVWindow(Gtk.ApplicationWindow):
             self.progress_bar.set_text("Scan Failed")
             self.progress_bar.set_fraction(0.0)
         
-        self.append_output(f"Scan finished at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+        finished = _now_str()
+        self.append_output(f"Scan finished at: {finished}")
         
         # Update last scan time
-        self.last_scan_label.set_text(f"Last scan: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+        self.last_scan_label.set_text(f"Last scan: {finished}")
         
         # Re-enable buttons
         self.enable_scan_buttons(True)
@@ -471,8 +726,9 @@ class XClamAVWindow(Gtk.ApplicationWindow):
         self.progress_bar.set_fraction(0.0)
         
         # Stop pulse timer
-        if hasattr(self, 'pulse_timer'):
+        if self.pulse_timer:
             GLib.source_remove(self.pulse_timer)
+            self.pulse_timer = 0
         
         # Re-enable buttons
         self.enable_scan_buttons(True)
@@ -486,6 +742,7 @@ class XClamAVWindow(Gtk.ApplicationWindow):
     
     def on_update_complete(self, success, output, error):
         """Handle database update completion"""
+        self.clamav.invalidate_install_cache()
         if success:
             self.append_output("Database updated successfully!")
         else:
@@ -508,7 +765,11 @@ class XClamAVWindow(Gtk.ApplicationWindow):
             dialog.destroy()
             return
         
-        dialog = SettingsDialog(self, self.settings)
+        # Pick up edits made to the settings file outside the application
+        if self.settings.reload():
+            self.apply_settings()
+        
+        dialog = SettingsDialog(self, self.settings, clamd_active=self.clamav.is_clamd_available())
         response = dialog.run()
         if response in (Gtk.ResponseType.OK, Gtk.ResponseType.APPLY):
             dialog.save_current_settings()
@@ -541,11 +802,24 @@ class XClamAVWindow(Gtk.ApplicationWindow):
                     pass
                 # "auto" uses system default
         
+        # Apply log level
+        advanced = self.settings.get("advanced")
+        if advanced:
+            # getLevelName maps known names to numbers; anything else falls back to INFO
+            level = logging.getLevelName(str(advanced.get("log_level", "info")).upper())
+            logging.getLogger().setLevel(level if isinstance(level, int) else logging.INFO)
+        
         # Apply scan options to ClamAV wrapper
         scan_options = self.settings.get("scan_options")
         if scan_options and hasattr(self.clamav, 'set_scan_options'):
             self.clamav.set_scan_options(scan_options)
     
+    def on_destroy(self, window):
+        """Stop scanning and write pending settings before the window goes away"""
+        self.clamav.shutdown()
+        if self.settings:
+            self.settings.flush()
+    
     def on_about(self, button):
         """Show about dialog"""
         about = Gtk.AboutDialog()
@@ -582,6 +856,7 @@ class XClamAVApplication(Gtk.Application):
 
 def main():
     """Main entry point"""
+    logging.basicConfig(format="%(name)s: %(levelname)s: %(message)s")
     app = XClamAVApplication()
     return app.run(sys.argv)
 